@@ -76,6 +76,7 @@ func recordAudio() async {
         let url = URL(fileURLWithPath: outputPath)
         let writer = try AVAssetWriter(outputURL: url, fileType: .wav)
         
+        // 48kHz, 16-bit, stereo PCM - shared by the system audio and microphone outputs
         let audioSettings: [String: Any] = [
             AVFormatIDKey: Int(kAudioFormatLinearPCM),
             AVSampleRateKey: 48000,
@@ -115,26 +116,13 @@ func recordAudio() async {
         // Set up microphone recording if needed
         var micRecorder: AVAudioRecorder?
         if recordingType == "microphone" || recordingType == "both" {
-            let micSettings: [String: Any] = [
-                AVFormatIDKey: Int(kAudioFormatLinearPCM),
-                AVSampleRateKey: 48000,
-                AVNumberOfChannelsKey: 2,
-                AVLinearPCMBitDepthKey: 16,
-                AVLinearPCMIsNonInterleaved: false,
-                AVLinearPCMIsFloatKey: false,
-                AVLinearPCMIsBigEndianKey: false
-            ]
-            
-            if recordingType == "microphone" {
-                // For microphone-only, record directly to output file
-                micRecorder = try AVAudioRecorder(url: url, settings: micSettings)
-                micRecorder?.record()
-            } else {
-                // For both, we'll need to mix later (simplified approach)
-                let micURL = URL(fileURLWithPath: outputPath.replacingOccurrences(of: ".wav", with: "_mic.wav"))
-                micRecorder = try AVAudioRecorder(url: micURL, settings: micSettings)
-                micRecorder?.record()
-            }
+            // For microphone-only, record directly to output file;
+            // for both, we'll need to mix later (simplified approach)
+            let micURL = recordingType == "microphone"
+                ? url
+                : URL(fileURLWithPath: outputPath.replacingOccurrences(of: ".wav", with: "_mic.wav"))
+            micRecorder = try AVAudioRecorder(url: micURL, settings: audioSettings)
+            micRecorder?.record()
         }
         
         // Start system audio recording if needed
@@ -143,8 +131,11 @@ func recordAudio() async {
             try await stream.startCapture()
         }
         
-        // Wait for specified duration
-        try await Task.sleep(nanoseconds: UInt64(duration * 1_000_000_000))
+        // Wait for specified duration, or until interrupted with Ctrl+C
+        let deadline = Date().addingTimeInterval(duration)
+        while !shouldStop && Date() < deadline {
+            try await Task.sleep(nanoseconds: 100_000_000)
+        }
         
         // Stop recording and finalize
         if recordingType == "internal" || recordingType == "both" {
@@ -17,126 +17,76 @@ but WITHOUT ANY WARRANTY; without even the implied warranty of
 MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
 """
 
+import argparse
 import subprocess
 import os
-from datetime import datetime
+import hashlib
+import functools
+import json
+import shutil
 import locale
+import math
+import signal
 import sys
-from typing import Dict, Any
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 
 # --- Configuration ---
 DEFAULT_DURATION = 10
 SWIFT_COMPILER = 'swiftc'
+SWIFT_COMPILER_FLAGS = ['-O', '-whole-module-optimization']
 RECORDER_EXECUTABLE = 'recorder'
+RECORDER_HASH_FILE = 'recorder.hash'
 SWIFT_SOURCE_FILE = 'core.swift'
 OUTPUT_FOLDER = 'output'
 
-# --- Internationalization (i18n) ---
-MESSAGES: Dict[str, Dict[str, str]] = {
-    'en': {
-        'swift_source_written': "Swift source written to {output_path}",
-        'compiling_swift_code': "Compiling Swift code: {command}",
-        'swift_compilation_successful': "Swift compilation successful.",
-        'compiler_output_stdout': "Compiler Output (stdout):\\n",
-
-        'compiler_output_stderr': "Compiler Output (stderr):\n",
-        'swift_compilation_failed': "Swift compilation failed: {error}",
-        'compiler_error_stdout': "Compiler Error (stdout):\n",
-        'compiler_error_stderr': "Compiler Error (stderr):\n",
-        'error_during_swift_compilation': "An error occurred during Swift compilation: {error}",
-        'cleaned_up': "Cleaned up {file}",
-        'enter_duration': "Enter recording duration in seconds (e.g., 60 for 1 minute): ",
-        'duration_positive': "Duration must be a positive number.",
-        'invalid_duration': "Invalid duration. Please enter a number.",
-        'failed_to_compile_swift': "Failed to compile Swift code. Exiting.",
-        'starting_recording': "Starting recording for {duration} seconds. Output will be saved to: {output_filepath}",
-        'recording_complete': "Recording complete. Audio saved to {output_filepath}",
-        'recording_failed': "Recording failed: {error}",
-        'swift_executable_error_stdout': "Swift Executable Error (stdout):\n",
-        'swift_executable_error_stderr': "Swift Executable Error (stderr):\n",
-        'unexpected_recording_error': "An unexpected error occurred during recording: {error}",
-        'macos_audio_recording': "macOS audio recording",
-        'choose_option': "\n1. Record internal audio only\n2. Record microphone only\n3. Record both (internal + microphone)\n\nChoice: ",
-        'enter_duration_prompt': "Recording duration in seconds (default: continuous until Ctrl+C): ",
-        'continuous_recording': "Press Enter for continuous recording, or enter duration in seconds: ",
-        'recording_started': "Recording started. Press Ctrl+C to stop and save.",
-        'recording_stopped': "Recording stopped by user.",
-        'compiling_in_progress': "Compiling in progress...",
-        'compilation_failed': "Compilation failed:\n{error}",
-        'running_in_progress': "Running in progress...",
-        'error_message': "Error: {error}",
-        'user_interrupted': "User interrupted",
-        'goodbye': "Goodbye!",
-        'recording_started_internal': "Recording internal audio. Press Ctrl+C to stop and save.",
-        'recording_started_microphone': "Recording microphone. Press Ctrl+C to stop and save.",
-        'recording_started_both': "Recording both internal audio and microphone. Press Ctrl+C to stop and save.",
-        'output_folder_created': "Created output folder: {folder}",
-        # Swift template messages
-        'swift_no_display': "No display found to capture.",
-        'swift_cannot_add_writer_input': "Cannot add asset writer input.",
-        'swift_recording_started': "Recording started. Press Ctrl+C to stop early or wait for duration.",
-        'swift_error_stopping': "Error stopping recording: {error.localizedDescription}",
-        'swift_recording_finished': "Recording finished after {Int(self?.recordingDuration ?? 0)} seconds.",
-        'swift_stream_stopped_error': "Stream stopped with error: {error.localizedDescription}",
-        'swift_usage': "Usage: {CommandLine.arguments[0]} <output_path> <duration_seconds>",
-        'swift_invalid_duration': "Invalid duration: {durationString}",
-        'swift_failed_to_start': "Failed to start recording: {error.localizedDescription}"
-    },
-    'zh_CN': {
-        'swift_source_written': "Swift 源代码已写入 {output_path}",
-        'compiling_swift_code': "正在编译 Swift 代码: {command}",
-        'swift_compilation_successful': "Swift 编译成功。",
-        'compiler_output_stdout': "编译器输出 (stdout):\n",
-        'compiler_output_stderr': "编译器输出 (stderr):\n",
-        'swift_compilation_failed': "Swift 编译失败: {error}",
-        'compiler_error_stdout': "编译器错误 (stdout):\n",
-        'compiler_error_stderr': "编译器错误 (stderr):\n",
-        'error_during_swift_compilation': "Swift 编译过程中发生错误: {error}",
-        'cleaned_up': "已清理 {file}",
-        'enter_duration': "请输入录音时长 (秒, 例如 60 代表 1 分钟): ",
-        'duration_positive': "时长必须是正数。",
-        'invalid_duration': "时长无效。请输入一个数字。",
-        'failed_to_compile_swift': "Swift 代码编译失败。正在退出。",
-        'starting_recording': "开始录音，时长 {duration} 秒。输出将保存到: {output_filepath}",
-        'recording_complete': "录音完成。音频已保存到 {output_filepath}",
-        'recording_failed': "录音失败: {error}",
-        'swift_executable_error_stdout': "Swift 可执行文件错误 (stdout):\n",
-        'swift_executable_error_stderr': "Swift 可执行文件错误 (stderr):\n",
-        'unexpected_recording_error': "录音过程中发生意外错误: {error}",
-        # Swift template messages
-        'swift_no_display': "未找到可捕获的显示器。",
-        'swift_cannot_add_writer_input': "无法添加资产写入器输入。",
-        'swift_recording_started': "录音已开始。按 Ctrl+C 提前停止或等待指定时长。",
-        'swift_error_stopping': r"停止录音时出错: {error.localizedDescription}",
-        'swift_recording_finished': r"录音在 {Int(self?.recordingDuration ?? 0)} 秒后完成。",
-        'swift_stream_stopped_error': r"流因错误停止: {error.localizedDescription}",
-        'swift_usage': r"用法: {CommandLine.arguments[0]} <输出路径> <时长秒>",
-        'swift_invalid_duration': r"无效时长: {durationString}",
-        'swift_failed_to_start': r"启动录音失败: {error.localizedDescription}",
-        'swift_recording_complete_with_path': r"完成: {outputPath}",
-        'swift_error_occurred': r"错误: {error}",
-        'macos_audio_recording': "macOS 音频录制",
-        'choose_option': "\n1. 仅录制内部音频\n2. 仅录制麦克风\n3. 同时录制两者 (内部+麦克风)\n\n选择: ",
-        'enter_duration_prompt': "录制秒数 (默认: 持续录制直到 Ctrl+C): ",
-        'continuous_recording': "按回车键持续录制，或输入录制秒数: ",
-        'recording_started': "录制已开始。按 Ctrl+C 停止并保存。",
-        'recording_stopped': "用户停止录制。",
-        'compiling_in_progress': "编译中...",
-        'compilation_failed': "编译失败:\n{error}",
-        'running_in_progress': "运行中...",
-        'error_message': "错误: {error}",
-        'user_interrupted': "用户中断操作",
-        'goodbye': "再见！",
-        'recording_started_internal': "正在录制内部音频。按 Ctrl+C 停止并保存。",
-        'recording_started_microphone': "正在录制麦克风。按 Ctrl+C 停止并保存。",
-        'recording_started_both': "正在同时录制内部音频和麦克风。按 Ctrl+C 停止并保存。",
-        'output_folder_created': "已创建输出文件夹: {folder}"
-    }
+# Separator line printed under the title
+_BANNER = "=" * 40
+
+# Start message shown for each recording type
+_TYPE_TO_MSG: Dict[str, str] = {
+    'internal': 'recording_started_internal',
+    'microphone': 'recording_started_microphone',
+    'both': 'recording_started_both'
 }
 
+# Per-process results of the filesystem checks, which don't change during a run
+_SWIFT_SRC_VERIFIED = False
+_EXE_READY: Optional[bool] = None
+_OUTPUT_READY = False
+
+# Background swiftc run started by start_compilation, with its source fingerprint
+_COMPILATION: Optional[Tuple[subprocess.Popen, Optional[str]]] = None
+
+# --- Internationalization (i18n) ---
+# Swift template messages: their {...} are Swift interpolations, not Python
+# format fields, so they are returned verbatim instead of being formatted
+_RAW_KEYS = frozenset({
+    'swift_no_display',
+    'swift_cannot_add_writer_input',
+    'swift_recording_started',
+    'swift_error_stopping',
+    'swift_recording_finished',
+    'swift_stream_stopped_error',
+    'swift_usage',
+    'swift_invalid_duration',
+    'swift_failed_to_start',
+    'swift_recording_complete_with_path',
+    'swift_error_occurred'
+})
+
+# Languages with an i18n/<lang>.json message file; only the one in use is loaded
+_LANGUAGES = frozenset({'en', 'zh_CN'})
+_I18N_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'i18n')
+
+@functools.lru_cache(maxsize=None)
 def detect_system_language() -> str:
     """Detect system language using multiple methods.
     
+    The probes (which may change the process locale and, on macOS, spawn
+    ``defaults``) run once; later calls return the cached result.
+    
     Returns:
         Language code (e.g., 'en', 'zh')
     """
@@ -202,9 +152,122 @@ def detect_system_language() -> str:
     return 'en'
 
 
+# A compiled message takes the format parameters and returns the final text
+_Formatter = Callable[[Dict[str, Any]], str]
+
+
+def _compile_messages(messages: Mapping[str, str]) -> Mapping[str, _Formatter]:
+    """Turn each message template into a formatter callable.
+    
+    Templates without placeholders and Swift templates (``_RAW_KEYS``)
+    become constant functions; the others are bound to ``str.format_map``
+    so no format method lookup or keyword unpacking happens per call.
+    
+    Args:
+        messages: Message templates keyed by message key
+        
+    Returns:
+        Read-only mapping of interned message keys to formatter callables
+    """
+    compiled: Dict[str, _Formatter] = {}
+    for key, template in messages.items():
+        if '{' in template and key not in _RAW_KEYS:
+            compiled[sys.intern(key)] = template.format_map
+        else:
+            compiled[sys.intern(key)] = lambda _params, template=template: template
+    # The compiled tables are cached and shared, so guard them against mutation
+    return MappingProxyType(compiled)
+
+
+@functools.lru_cache(maxsize=None)
+def _message_templates(lang_code: str) -> Mapping[str, str]:
+    """Load the message templates for a language.
+    
+    A missing or unreadable message file gives an empty table, so lookups
+    report ``MISSING_TRANSLATION_<key>``; either way the file is read once.
+    
+    Args:
+        lang_code: One of ``_LANGUAGES``
+        
+    Returns:
+        Read-only message templates keyed by message key
+    """
+    try:
+        with open(os.path.join(_I18N_DIR, f'{lang_code}.json'), 'rb') as messages_file:
+            return MappingProxyType(json.load(messages_file))
+    except (OSError, ValueError):
+        return MappingProxyType({})
+
+
+@functools.lru_cache(maxsize=None)
+def _load_messages(lang_code: str) -> Mapping[str, _Formatter]:
+    """Load and compile the message table for a language on first use.
+    
+    Args:
+        lang_code: One of ``_LANGUAGES``
+        
+    Returns:
+        Compiled messages for the language
+    """
+    return _compile_messages(_message_templates(lang_code))
+
+
+def _lang_from_env() -> Optional[str]:
+    """Read the language code from the POSIX locale environment variables.
+    
+    Returns:
+        Language code (e.g., 'en', 'zh'), or None if none is set
+    """
+    for env_var in ('LC_ALL', 'LC_MESSAGES', 'LANG'):
+        lang = os.environ.get(env_var)
+        if lang:
+            # Extract language code from formats like 'zh_CN.UTF-8'
+            return lang.split('.', 1)[0].split('_', 1)[0].lower()
+    return None
+
+
+# Language code from the environment, read once at import
+_LANG_CODE: Optional[str] = _lang_from_env()
+
+# Compiled messages for the detected language, resolved on first use
+_MESSAGES_CACHE: Optional[Mapping[str, _Formatter]] = None
+
+
+def _resolve_messages() -> Mapping[str, _Formatter]:
+    """Resolve the compiled message table for the system language.
+    
+    The full ``detect_system_language`` probe only runs when the locale
+    environment variables are unset.
+    
+    Returns:
+        Messages for the detected language, or English if unsupported
+    """
+    lang_code = _LANG_CODE or detect_system_language()
+    
+    # All Chinese variants use Simplified Chinese for now
+    # (could be extended for Traditional Chinese)
+    if lang_code == 'zh':
+        lang_code = 'zh_CN'
+    
+    if lang_code not in _LANGUAGES:
+        lang_code = 'en'
+    return _load_messages(lang_code)
+
+
+def _reset_locale_cache() -> None:
+    """Forget the cached message table so the next lookup re-detects the locale."""
+    global _LANG_CODE, _MESSAGES_CACHE
+    detect_system_language.cache_clear()
+    _LANG_CODE = _lang_from_env()
+    _MESSAGES_CACHE = None
+
+
 def get_message(key: str, **kwargs: Any) -> str:
     """Get a translated message based on the current locale.
     
+    The locale is detected once per process; call ``_reset_locale_cache``
+    to pick up a locale change.
+    
     Args:
         key: The message key to look up
         **kwargs: Format parameters for the message
@@ -212,39 +275,26 @@ def get_message(key: str, **kwargs: Any) -> str:
     Returns:
         Formatted message string in the appropriate language
     """
+    global _MESSAGES_CACHE
     try:
-        lang_code = detect_system_language()
-        
-        # Handle Chinese language variants
-        if lang_code == 'zh':
-            # Check for specific Chinese variants
-            try:
-                lang, _ = locale.getlocale()
-                if lang and ('CN' in lang or 'Hans' in lang):
-                    lang_code = 'zh_CN'
-                elif lang and ('TW' in lang or 'HK' in lang or 'Hant' in lang):
-                    lang_code = 'zh_CN'  # Could be extended for Traditional Chinese
-                else:
-                    lang_code = 'zh_CN'  # Default to Simplified Chinese
-            except (AttributeError, ValueError, locale.Error):
-                lang_code = 'zh_CN'
-        
-        # Get messages for detected language, fallback to English
-        messages = MESSAGES.get(lang_code, MESSAGES['en'])
+        if _MESSAGES_CACHE is None:
+            _MESSAGES_CACHE = _resolve_messages()
         
         # Get specific message, fallback to English, then show missing key
-        message = messages.get(key)
-        if message is None:
-            message = MESSAGES['en'].get(key)
-            if message is None:
-                message = f"MISSING_TRANSLATION_{key}"
+        try:
+            formatter = _MESSAGES_CACHE[key]
+        except KeyError:
+            formatter = _load_messages('en').get(key)
+            if formatter is None:
+                return f"MISSING_TRANSLATION_{key}"
         
-        return message.format(**kwargs)
+        return formatter(kwargs)
         
     except Exception:
         # Ultimate fallback with error logging
         try:
-            return MESSAGES['en'].get(key, f"MISSING_TRANSLATION_{key}").format(**kwargs)
+            message = _message_templates('en').get(key, f"MISSING_TRANSLATION_{key}")
+            return message.format_map(kwargs) if kwargs else message
         except Exception:
             return f"TRANSLATION_ERROR_{key}"
 
@@ -257,12 +307,42 @@ def verify_swift_source() -> str:
     Raises:
         FileNotFoundError: If core.swift is not found
     """
+    global _SWIFT_SRC_VERIFIED
+    if _SWIFT_SRC_VERIFIED:
+        return SWIFT_SOURCE_FILE
+    
     if not os.path.exists(SWIFT_SOURCE_FILE):
         raise FileNotFoundError(f"{SWIFT_SOURCE_FILE} not found")
     
+    _SWIFT_SRC_VERIFIED = True
     return SWIFT_SOURCE_FILE
 
 
+def _duration_error(value: str) -> Optional[str]:
+    """Check a duration in seconds.
+    
+    Args:
+        value: Stripped duration string
+        
+    Returns:
+        Message key describing the problem, or None if the duration is valid
+    """
+    # Whole seconds are the common case and need no float parsing; longer
+    # inputs go through float() so int() never sees a huge digit string
+    if len(value) <= 9 and value.isdecimal() and int(value) > 0:
+        return None
+    try:
+        duration = float(value)
+    except ValueError:
+        return 'invalid_duration'
+    # float() also accepts 'nan' and 'inf', which the recorder cannot wait for
+    if not math.isfinite(duration):
+        return 'invalid_duration'
+    if duration <= 0:
+        return 'duration_positive'
+    return None
+
+
 def get_duration_input() -> str:
     """Get recording duration from user input with validation.
     
@@ -276,25 +356,68 @@ def get_duration_input() -> str:
         duration_input = input(get_message('continuous_recording')).strip()
         if not duration_input:
             return 'continuous'
-        # Validate that it's a positive number
-        try:
-            duration = float(duration_input)
-            if duration <= 0:
-                print(get_message('duration_positive'))
-                return 'continuous'
-            return duration_input
-        except ValueError:
-            print(get_message('invalid_duration'))
+        error = _duration_error(duration_input)
+        if error:
+            print(get_message(error))
             return 'continuous'
+        return duration_input
     except KeyboardInterrupt:
         raise
 
 
+def parse_duration_arg(value: str) -> str:
+    """Validate the ``--duration`` command-line argument.
+    
+    Args:
+        value: Duration in seconds, or 'continuous'
+        
+    Returns:
+        The validated duration string
+        
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a finite positive number
+    """
+    value = value.strip()
+    if value == 'continuous':
+        return value
+    error = _duration_error(value)
+    if error:
+        raise argparse.ArgumentTypeError(get_message(error))
+    return value
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options for non-interactive use.
+    
+    Options that are given replace the matching interactive prompt.
+    
+    Args:
+        argv: Arguments to parse, defaults to ``sys.argv[1:]``
+        
+    Returns:
+        Parsed options; ``choice`` and ``duration`` are None when omitted
+    """
+    parser = argparse.ArgumentParser(description=get_message('arg_description'))
+    parser.add_argument('--choice', choices=['1', '2', '3'],
+                        help=get_message('arg_choice_help'))
+    parser.add_argument('--duration', type=parse_duration_arg,
+                        help=get_message('arg_duration_help'))
+    return parser.parse_args(argv)
+
+
 def ensure_output_folder() -> None:
     """Ensure output folder exists."""
-    if not os.path.exists(OUTPUT_FOLDER):
+    global _OUTPUT_READY
+    if _OUTPUT_READY:
+        return
+    
+    # Creating directly costs one syscall whether or not the folder exists
+    try:
         os.makedirs(OUTPUT_FOLDER)
         print(get_message('output_folder_created', folder=OUTPUT_FOLDER))
+    except FileExistsError:
+        pass
+    _OUTPUT_READY = True
 
 
 def generate_output_filename() -> str:
@@ -304,41 +427,149 @@ def generate_output_filename() -> str:
         Full path to output file in output folder
     """
     ensure_output_folder()
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
     filename = f"recording_{timestamp}.wav"
     return os.path.join(OUTPUT_FOLDER, filename)
 
 
-def ensure_executable() -> bool:
-    """Ensure Swift executable exists, compile if necessary.
+@functools.lru_cache(maxsize=None)
+def swift_compiler_path() -> str:
+    """Resolve the Swift compiler once per process.
+    
+    Returns:
+        Absolute path to the compiler, or its bare name if not on PATH
+    """
+    return shutil.which(SWIFT_COMPILER) or SWIFT_COMPILER
+
+
+def source_fingerprint() -> str:
+    """Compute a fingerprint of the Swift source and compiler flags.
+    
+    Returns:
+        SHA-256 hex digest identifying the build inputs
+        
+    Raises:
+        OSError: If the Swift source cannot be read
+    """
+    digest = hashlib.sha256()
+    with open(SWIFT_SOURCE_FILE, 'rb') as source:
+        digest.update(source.read())
+    digest.update(' '.join(SWIFT_COMPILER_FLAGS).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _mtime(path: str) -> Optional[float]:
+    """Get a file's modification time with a single stat call.
+    
+    Args:
+        path: File to check
         
     Returns:
-        True if executable is available, False otherwise
+        Modification time, or None if the file is missing or unreadable
     """
-    # Check if executable already exists and is newer than source
-    if os.path.exists(RECORDER_EXECUTABLE):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def start_compilation() -> None:
+    """Start compiling the Swift executable in the background if necessary.
+    
+    The recorder is built in one optimized whole-module pass
+    (``SWIFT_COMPILER_FLAGS``); batch mode has nothing to batch for a
+    single source file. An executable newer than the source is reused as
+    is. Otherwise it is only rebuilt when the content hash of the source
+    and flags differs from the one recorded at the last build. A flag
+    change alone is therefore not noticed while the executable is newer
+    than the source; delete ``recorder`` to force a rebuild.
+    
+    The compiler runs while the caller carries on with other work;
+    ``ensure_executable`` waits for it and reports the result.
+    
+    Raises:
+        FileNotFoundError: If the Swift compiler cannot be found
+    """
+    global _EXE_READY, _COMPILATION
+    if _EXE_READY is not None or _COMPILATION is not None:
+        return
+    
+    # Check if executable already exists and is newer than source; if we
+    # can't check times, fall back to the hash check
+    exe_time = _mtime(RECORDER_EXECUTABLE)
+    src_time = _mtime(SWIFT_SOURCE_FILE)
+    
+    # If executable is newer than source, no need to recompile
+    if exe_time is not None and src_time is not None and exe_time > src_time:
+        _EXE_READY = True
+        return
+    
+    # The source may only have been touched (e.g. by git checkout), so
+    # compare its content hash with the one recorded at the last build
+    try:
+        fingerprint: Optional[str] = source_fingerprint()
+    except OSError:
+        fingerprint = None
+    
+    if fingerprint and exe_time is not None:
         try:
-            exe_time = os.path.getmtime(RECORDER_EXECUTABLE)
-            src_time = os.path.getmtime(SWIFT_SOURCE_FILE)
-            
-            # If executable is newer than source, no need to recompile
-            if exe_time > src_time:
-                return True
+            with open(RECORDER_HASH_FILE, 'r', encoding='utf-8') as hash_file:
+                if hash_file.read().strip() == fingerprint:
+                    # Refresh the mtime so the next run takes the fast path
+                    os.utime(RECORDER_EXECUTABLE)
+                    _EXE_READY = True
+                    return
         except OSError:
-            pass  # If we can't check times, just recompile
+            pass  # No usable hash, just recompile
     
-    # Compile Swift code
+    # Compile Swift code. -num-threads would not help: whole-module builds
+    # split backend work per source file, and the recorder has only one
     print(get_message('compiling_in_progress'))
-    result = subprocess.run(
-        [SWIFT_COMPILER, SWIFT_SOURCE_FILE, '-o', RECORDER_EXECUTABLE],
-        capture_output=True,
-        text=True
+    compiler = subprocess.Popen(
+        [swift_compiler_path(), *SWIFT_COMPILER_FLAGS, SWIFT_SOURCE_FILE, '-o', RECORDER_EXECUTABLE],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
     )
+    _COMPILATION = (compiler, fingerprint)
+
+
+def ensure_executable() -> bool:
+    """Ensure Swift executable exists, compile if necessary.
     
-    if result.returncode != 0:
-        print(get_message('compilation_failed', error=result.stderr))
+    Waits for a compilation begun by ``start_compilation``, or runs one now.
+    The outcome is remembered for the rest of the process, so repeated
+    calls neither stat the files again nor retry a failed compilation.
+        
+    Returns:
+        True if executable is available, False otherwise
+        
+    Raises:
+        FileNotFoundError: If the Swift compiler cannot be found
+    """
+    global _EXE_READY, _COMPILATION
+    start_compilation()
+    if _EXE_READY is not None:
+        return _EXE_READY
+    
+    compiler, fingerprint = _COMPILATION
+    _COMPILATION = None
+    _, stderr = compiler.communicate()
+    
+    if compiler.returncode != 0:
+        # Compiler output is only decoded when it is actually shown
+        error = stderr.decode('utf-8', errors='replace')
+        print(get_message('compilation_failed', error=error))
+        _EXE_READY = False
         return False
     
+    if fingerprint:
+        try:
+            with open(RECORDER_HASH_FILE, 'w', encoding='utf-8') as hash_file:
+                hash_file.write(fingerprint)
+        except OSError:
+            pass  # Only costs a recompile next time
+    
+    _EXE_READY = True
     return True
 
 
@@ -351,39 +582,29 @@ def run_recording(output_file: str, duration: str, recording_type: str) -> None:
         recording_type: Type of recording ('internal', 'microphone', 'both')
     """
     # Show appropriate message based on recording type
-    if recording_type == 'internal':
-        message_key = 'recording_started_internal'
-    elif recording_type == 'microphone':
-        message_key = 'recording_started_microphone'
-    elif recording_type == 'both':
-        message_key = 'recording_started_both'
-    else:
-        message_key = 'recording_started'
+    message_key = _TYPE_TO_MSG.get(recording_type, 'recording_started')
     
     if duration == 'continuous':
         print(get_message(message_key))
-        try:
-            # Run with a very long duration, user will interrupt with Ctrl+C
-            subprocess.run(
-                [f'./{RECORDER_EXECUTABLE}', output_file, '86400', recording_type],  # 24 hours max
-                capture_output=False,  # Allow real-time output
-                text=True
-            )
-        except KeyboardInterrupt:
-            print(f"\n{get_message('recording_stopped')}")
-            # The Swift program should handle SIGINT gracefully
-            return
+        # Run with a very long duration, user will interrupt with Ctrl+C
+        duration = '86400'  # 24 hours max
     else:
         print(get_message('running_in_progress'))
-        try:
-            subprocess.run(
-                [f'./{RECORDER_EXECUTABLE}', output_file, duration, recording_type],
-                capture_output=False,
-                text=True
-            )
-        except KeyboardInterrupt:
-            print(f"\n{get_message('recording_stopped')}")
-            return
+    
+    # The recorder inherits our stdout/stderr, so its output goes straight
+    # to the terminal without being buffered or decoded in Python. Flush
+    # first so our messages still come before it when stdout is a file/pipe.
+    sys.stdout.flush()
+    recorder = subprocess.Popen(
+        [f'./{RECORDER_EXECUTABLE}', output_file, duration, recording_type]
+    )
+    try:
+        recorder.wait()
+    except KeyboardInterrupt:
+        print(f"\n{get_message('recording_stopped')}")
+        # Let the Swift program stop capturing and finalize the file
+        recorder.send_signal(signal.SIGINT)
+        recorder.wait()
 
 
 def cleanup_files() -> None:
@@ -416,21 +637,30 @@ def handle_user_input() -> str:
         raise
 
 
-def main() -> None:
-    """Main application entry point."""
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main application entry point.
+    
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+    """
+    args = parse_args(argv)
     try:
         print(get_message('macos_audio_recording'))
-        print("=" * 40)
+        print(_BANNER)
         
-        choice = handle_user_input()
+        choice = args.choice or handle_user_input()
         
         if choice in ["1", "2", "3"]:
             try:
-                duration = get_duration_input()
-                output_file = generate_output_filename()
-                
                 verify_swift_source()
                 
+                # Compile (if needed) while the user is prompted and the
+                # output folder is prepared
+                start_compilation()
+                
+                duration = args.duration or get_duration_input()
+                output_file = generate_output_filename()
+                
                 if not ensure_executable():
                     return
                 
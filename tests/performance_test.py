@@ -8,8 +8,9 @@ This script measures the performance of various components of the application.
 import time
 import sys
 import os
+import resource
 import subprocess
-import psutil
+from timeit import Timer
 from typing import Dict, Any, Callable
 
 # Add the current directory to path so we can import our module
@@ -24,32 +25,49 @@ def measure_time(func: Callable, *args, **kwargs) -> tuple:
     end_time = time.perf_counter()
     return result, end_time - start_time
 
+def peak_memory_mb() -> float:
+    """Peak resident memory of this process in MB.
+    
+    ru_maxrss is reported in bytes on macOS but in kilobytes on Linux.
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss / 1024 / 1024
+    return max_rss / 1024
+
+def cpu_percent(cpu_elapsed: float, wall_elapsed: float) -> float:
+    """CPU time as a percentage of the wall time it was measured over.
+    
+    Callers read the wall clock outside the CPU clock on both ends, so the
+    CPU window never spans more than the wall window.
+    """
+    if wall_elapsed <= 0:
+        return 0.0
+    return cpu_elapsed / wall_elapsed * 100
+
+def measure_average_time(func: Callable) -> tuple:
+    """Measure the average time per call, letting timeit pick the call count."""
+    iterations, elapsed = Timer(func).autorange()
+    return elapsed / iterations, iterations
+
 def measure_memory_usage(func: Callable, *args, **kwargs) -> tuple:
-    """Measure memory usage of a function."""
-    process = psutil.Process()
-    mem_before = process.memory_info().rss / 1024 / 1024  # MB
-    
+    """Measure memory usage of a function (peak RSS once it has run)."""
     start_time = time.perf_counter()
     result = func(*args, **kwargs)
     end_time = time.perf_counter()
     
-    mem_after = process.memory_info().rss / 1024 / 1024  # MB
-    
-    return result, end_time - start_time, mem_after - mem_before
+    return result, end_time - start_time, peak_memory_mb()
 
 def test_language_detection():
     """Test language detection performance."""
     print("🧪 Testing language detection...")
     
-    # Test multiple calls to see if caching would help
-    times = []
-    for i in range(10):
-        _, exec_time = measure_time(audio_kit.detect_system_language)
-        times.append(exec_time)
+    # The first call does the actual probing, later ones are served from cache
+    _, first_time = measure_time(audio_kit.detect_system_language)
+    avg_time, iterations = measure_average_time(audio_kit.detect_system_language)
     
-    avg_time = sum(times) / len(times)
-    print(f"   Average language detection time: {avg_time:.4f}s")
-    print(f"   Min time: {min(times):.4f}s, Max time: {max(times):.4f}s")
+    print(f"   First language detection time: {first_time:.4f}s")
+    print(f"   Average language detection time: {avg_time * 1e6:.3f}µs ({iterations} calls)")
     
     return avg_time
 
@@ -70,11 +88,11 @@ def test_message_translation():
     
     times = []
     for key in test_keys:
-        _, exec_time = measure_time(audio_kit.get_message, key)
+        exec_time, _ = measure_average_time(lambda: audio_kit.get_message(key))
         times.append(exec_time)
     
     avg_time = sum(times) / len(times)
-    print(f"   Average message translation time: {avg_time:.4f}s")
+    print(f"   Average message translation time: {avg_time * 1e6:.3f}µs")
     print(f"   Tested {len(test_keys)} keys")
     
     return avg_time
@@ -136,48 +154,44 @@ def test_memory_usage():
     """Test memory usage."""
     print("🧪 Testing memory usage...")
     
-    process = psutil.Process()
-    initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-    
-    # Load module and run basic operations
-    _, _, mem_change = measure_memory_usage(test_startup_performance)
+    # Load module and run basic operations; the peak only ever grows, so
+    # report the absolute figure rather than a difference of two peaks
+    _, _, peak_memory = measure_memory_usage(test_startup_performance)
     
-    current_memory = process.memory_info().rss / 1024 / 1024  # MB
+    print(f"   Peak memory: {peak_memory:.2f} MB")
     
-    print(f"   Initial memory: {initial_memory:.2f} MB")
-    print(f"   Current memory: {current_memory:.2f} MB")
-    print(f"   Memory change: {mem_change:.2f} MB")
-    
-    return current_memory - initial_memory
+    return peak_memory
 
 def test_cpu_usage():
     """Test CPU usage during various operations."""
     print("🧪 Testing CPU usage...")
     
-    process = psutil.Process()
+    time.sleep(0.1)  # Let CPU settle once, before any measurement
     
     # Test CPU during language detection
-    time.sleep(0.1)  # Let CPU settle
-    
-    start_time = time.time()
+    start_time = time.perf_counter()
+    cpu_start = time.process_time()
     for _ in range(50):  # Run multiple times to get measurable CPU usage
         audio_kit.detect_system_language()
-    end_time = time.time()
+    cpu_end = time.process_time()
+    end_time = time.perf_counter()
     
-    cpu_lang = process.cpu_percent()
+    cpu_time = cpu_end - cpu_start
+    cpu_lang = cpu_percent(cpu_end - cpu_start, end_time - start_time)
     print(f"   Language detection CPU usage: {cpu_lang:.1f}%")
     print(f"   50 language detections took: {(end_time - start_time):.4f}s")
     
     # Test CPU during message translation
-    time.sleep(0.1)
-    
-    start_time = time.time()
+    start_time = time.perf_counter()
+    cpu_start = time.process_time()
     for _ in range(100):  # Run multiple times
         audio_kit.get_message('macos_audio_recording')
         audio_kit.get_message('choose_option')
-    end_time = time.time()
+    cpu_end = time.process_time()
+    end_time = time.perf_counter()
     
-    cpu_msg = process.cpu_percent()
+    cpu_time += cpu_end - cpu_start
+    cpu_msg = cpu_percent(cpu_end - cpu_start, end_time - start_time)
     print(f"   Message translation CPU usage: {cpu_msg:.1f}%")
     print(f"   200 message translations took: {(end_time - start_time):.4f}s")
     
@@ -185,23 +199,26 @@ def test_cpu_usage():
     cpu_compile = 0
     if not os.path.exists('recorder'):
         print("   Testing CPU during compilation...")
-        time.sleep(0.1)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
+        cpu_start = time.process_time()
         audio_kit.ensure_executable()
-        end_time = time.time()
+        cpu_end = time.process_time()
+        end_time = time.perf_counter()
         
-        cpu_compile = process.cpu_percent()
+        # swiftc runs in a child process, so this only covers our side
+        cpu_time += cpu_end - cpu_start
+        cpu_compile = cpu_percent(cpu_end - cpu_start, end_time - start_time)
         print(f"   Compilation CPU usage: {cpu_compile:.1f}%")
         print(f"   Compilation took: {(end_time - start_time):.4f}s")
     else:
         print("   Executable exists, skipping compilation CPU test")
     
-    # Get overall CPU usage
-    cpu_percent = process.cpu_percent(interval=1)
-    print(f"   Overall process CPU usage: {cpu_percent:.1f}%")
+    # The workloads are CPU-bound, so their CPU time says more than an
+    # overall percentage, which would only reflect how much idle time it spans
+    print(f"   CPU time across workloads: {cpu_time:.4f}s")
     
-    return cpu_percent
+    return cpu_time
 
 def run_performance_tests():
     """Run all performance tests."""
@@ -229,7 +246,7 @@ def run_performance_tests():
     results['memory_usage'] = test_memory_usage()
     print()
     
-    results['cpu_usage'] = test_cpu_usage()
+    results['cpu_time'] = test_cpu_usage()
     print()
     
     # Summary
@@ -238,8 +255,6 @@ def run_performance_tests():
     for test_name, result in results.items():
         if test_name == 'memory_usage':
             print(f"{test_name:20}: {result:.2f} MB")
-        elif test_name == 'cpu_usage':
-            print(f"{test_name:20}: {result:.1f}%")
         else:
             print(f"{test_name:20}: {result:.4f}s")
     
@@ -254,8 +269,8 @@ def run_performance_tests():
     else:
         print("⚠️  Startup performance: Could be improved (> 0.5s)")
     
-    if results['memory_usage'] < 10:
-        print("✅ Memory usage: Excellent (< 10 MB)")
+    if results['memory_usage'] < 30:
+        print("✅ Memory usage: Excellent (< 30 MB)")
     elif results['memory_usage'] < 50:
         print("✅ Memory usage: Good (< 50 MB)")
     else:
@@ -279,16 +294,10 @@ def run_performance_tests():
         print("• Swift compilation is the main bottleneck")
         print("• Consider pre-compiling for distribution")
     
-    if results['memory_usage'] > 20:
+    if results['memory_usage'] > 50:
         print("• Consider optimizing memory usage")
     
-    if results['cpu_usage'] > 50:
-        print("• High CPU usage detected")
-        print("• Consider optimizing computational operations")
-    elif results['cpu_usage'] < 10:
-        print("• CPU usage is very low - excellent efficiency")
-    
-    if all(v < 0.1 for k, v in results.items() if k not in ['memory_usage', 'compilation', 'cpu_usage']):
+    if all(v < 0.1 for k, v in results.items() if k not in ['memory_usage', 'compilation', 'cpu_time']):
         print("• Overall performance is excellent!")
 
 if __name__ == "__main__":